@@ -0,0 +1,232 @@
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from operator import itemgetter
+from rules import CLASSIC_SOS
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".sos_analysis_cache.sqlite3")
+
+# The 8 symmetries of a square board, mapping (row, col) to its new position
+SYMMETRIES = (
+	lambda r, c, n: (r, c),
+	lambda r, c, n: (c, n - 1 - r),          # Rotate 90
+	lambda r, c, n: (n - 1 - r, n - 1 - c),  # Rotate 180
+	lambda r, c, n: (n - 1 - c, r),          # Rotate 270
+	lambda r, c, n: (r, n - 1 - c),          # Mirror left-right
+	lambda r, c, n: (n - 1 - r, c),          # Mirror top-bottom
+	lambda r, c, n: (c, r),                  # Transpose
+	lambda r, c, n: (n - 1 - c, n - 1 - r),  # Anti-transpose
+)
+
+
+@lru_cache(maxsize=None)
+def symmetry_permutations(board_size):
+	"""For each symmetry, the original flat index of every transformed cell"""
+	permutations = []
+	for transform in SYMMETRIES:
+		permutation = [0] * (board_size * board_size)
+		for row in range(board_size):
+			for col in range(board_size):
+				new_row, new_col = transform(row, col, board_size)
+				permutation[new_row * board_size + new_col] = row * board_size + col
+		permutations.append(tuple(permutation))
+	return tuple(permutations)
+
+
+@lru_cache(maxsize=None)
+def _symmetry_getters(board_size):
+	return tuple((itemgetter(*permutation), permutation)
+				 for permutation in symmetry_permutations(board_size))
+
+
+def canonical_position(board):
+	"""
+	Returns (text, permutation) for the smallest text of the board under its
+	8 symmetries. permutation[i] is the original flat index of canonical cell i.
+	"""
+	flat = [cell or '.' for row in board for cell in row]
+	if len(flat) == 1:
+		return flat[0], (0,)
+	return min((''.join(getter(flat)), permutation)
+			   for getter, permutation in _symmetry_getters(len(board)))
+
+
+class AnalysisCache:
+	"""
+	On-disk cache of position evaluations, shared across sessions and processes.
+	An evaluation is a move with its score, or no move when nothing scores.
+	Keys are positions canonicalized under the board's symmetries together
+	with rule, game mode and side to move. Entries beyond max_entries are
+	evicted least recently used first, checked every evict_every inserts.
+
+	The database runs in WAL mode, so lookups are plain reads that never wait
+	on writers. New entries are written store_batch at a time, so other
+	processes see them after the next batch or close(). Recency is recorded in
+	memory and written in batches without waiting for the lock. Any database
+	error is treated as a miss or a skipped write: the cache is only an
+	optimization.
+	"""
+
+	def __init__(self, path=DEFAULT_CACHE_PATH, max_entries=100000, timeout=0.5,
+				 evict_every=100, touch_batch=64, store_batch=32):
+		self.path = path
+		self.max_entries = max_entries
+		self.timeout = timeout  # Seconds a store waits for the write lock
+		self.evict_every = evict_every
+		self.touch_batch = touch_batch
+		self.store_batch = store_batch
+		self._local = threading.local()
+		self._connection()  # Create the schema up front so errors surface here
+
+	def _connection(self):
+		"""One connection per process and thread, reopened after a fork"""
+		connection = getattr(self._local, "connection", None)
+		if connection is not None and self._local.pid == os.getpid():
+			return connection
+
+		connection = sqlite3.connect(self.path, timeout=self.timeout)
+		connection.execute("PRAGMA journal_mode=WAL")
+		connection.execute("PRAGMA synchronous=NORMAL")
+		connection.execute("""CREATE TABLE IF NOT EXISTS evaluations (
+			key TEXT PRIMARY KEY,
+			move INTEGER,
+			letter TEXT,
+			score REAL NOT NULL,
+			last_used REAL NOT NULL)""")
+		connection.execute("CREATE INDEX IF NOT EXISTS evaluations_last_used ON evaluations (last_used)")
+		connection.commit()
+		self._local.connection = connection
+		self._local.pid = os.getpid()
+		self._local.touched = {}  # key -> last_used not yet written
+		self._local.pending = {}  # key -> (move, letter, score) not yet written
+		self._local.inserts = 0
+		return connection
+
+	@staticmethod
+	def position_key(game_logic):
+		"""Returns (key, permutation) for the game's current position"""
+		text, permutation = canonical_position(game_logic.board)
+		# The classic rule scores differently from a plain PatternRule("SOS")
+		rule = "classic" if game_logic.rule is CLASSIC_SOS else game_logic.rule.key
+		key = (f"{rule}|{game_logic.game_mode}|{game_logic.current_player.color}|"
+			   f"{game_logic.board_size}|{text}")
+		return key, permutation
+
+	def lookup(self, game_logic, position=None):
+		"""
+		Returns the cached (move, score) for the position, move being
+		(row, col, letter) or None if nothing scores, or None on a miss.
+		position is the position_key result, if the caller already has it.
+		"""
+		key, permutation = position or self.position_key(game_logic)
+		try:
+			connection = self._connection()
+			found = self._local.pending.get(key)
+			if found is not None:
+				return self._decode(game_logic, permutation, found)
+			found = connection.execute(
+				"SELECT move, letter, score FROM evaluations WHERE key = ?", (key,)).fetchone()
+			if found is None:
+				return None
+			touched = self._local.touched
+			touched[key] = time.time()
+			if len(touched) >= self.touch_batch:
+				self._write_touched(connection)
+		except sqlite3.Error:
+			return None
+		return self._decode(game_logic, permutation, found)
+
+	@staticmethod
+	def _decode(game_logic, permutation, found):
+		move, letter, score = found
+		if move is None:
+			return None, score
+		row, col = divmod(permutation[move], game_logic.board_size)
+		return (row, col, letter), score
+
+	def _write_touched(self, connection):
+		"""Write batched recency updates, giving up at once if another process is writing"""
+		connection.execute("PRAGMA busy_timeout = 0")
+		try:
+			with connection:
+				self._flush_touched(connection)
+		except sqlite3.OperationalError:
+			if len(self._local.touched) > 10 * self.touch_batch:
+				self._local.touched.clear()  # Recency is approximate anyway
+		finally:
+			connection.execute(f"PRAGMA busy_timeout = {int(self.timeout * 1000)}")
+
+	def _flush_touched(self, connection):
+		touched = self._local.touched
+		if touched:
+			connection.executemany("UPDATE evaluations SET last_used = ? WHERE key = ?",
+								   [(used, key) for key, used in touched.items()])
+			touched.clear()
+
+	def store(self, game_logic, move, score, position=None):
+		"""Cache move = (row, col, letter), or None for no move, with its score"""
+		key, permutation = position or self.position_key(game_logic)
+		canonical_move = letter = None
+		if move is not None:
+			row, col, letter = move
+			canonical_move = permutation.index(row * game_logic.board_size + col)
+
+		try:
+			connection = self._connection()
+			pending = self._local.pending
+			pending[key] = (canonical_move, letter, score)
+			if len(pending) >= self.store_batch:
+				self._write_pending(connection)
+		except sqlite3.Error:
+			pass  # Locked past the timeout or unreadable; skip these entries
+
+	def _write_pending(self, connection):
+		pending = self._local.pending
+		if not pending:
+			return
+		try:
+			with connection:
+				self._flush_touched(connection)
+				now = time.time()
+				connection.executemany("INSERT OR REPLACE INTO evaluations VALUES (?, ?, ?, ?, ?)",
+									   [(key, move, letter, score, now)
+										for key, (move, letter, score) in pending.items()])
+				inserts = self._local.inserts + len(pending)
+				if inserts // self.evict_every != self._local.inserts // self.evict_every:
+					self._evict(connection)
+				self._local.inserts = inserts
+		finally:
+			pending.clear()
+
+	def _evict(self, connection):
+		(count,) = connection.execute("SELECT COUNT(*) FROM evaluations").fetchone()
+		if count > self.max_entries:
+			connection.execute("""DELETE FROM evaluations WHERE key IN (
+				SELECT key FROM evaluations ORDER BY last_used LIMIT ?)""",
+							   (count - self.max_entries,))
+
+	def __len__(self):
+		"""Number of entries on disk, after writing this thread's pending ones"""
+		self._write_pending(self._connection())
+		(count,) = self._connection().execute("SELECT COUNT(*) FROM evaluations").fetchone()
+		return count
+
+	def clear(self):
+		with self._connection() as connection:
+			connection.execute("DELETE FROM evaluations")
+			self._local.touched.clear()
+			self._local.pending.clear()
+
+	def close(self):
+		connection = getattr(self._local, "connection", None)
+		if connection is not None:
+			try:
+				self._write_pending(connection)
+				self._write_touched(connection)
+			except sqlite3.Error:
+				pass
+			finally:
+				connection.close()
+				self._local.connection = None
@@ -0,0 +1,93 @@
+import random
+import timeit
+from main import SOSGameLogic
+
+
+def random_game(board_size, rule=None, seed=0):
+	"""A board filled with a random mix of S, O and empty cells"""
+	rng = random.Random(seed)
+	game = SOSGameLogic(board_size, rule)
+	game.board = [[rng.choice(['S', 'O', '']) for _ in range(board_size)]
+				  for _ in range(board_size)]
+	return game
+
+
+def hardcoded_sos_at_position(board, row, col):
+	"""The SOS checks SOSGameLogic used before rules were compiled, kept as a baseline"""
+	directions = [
+		(-1, -1), (-1, 0), (-1, 1),
+		(0, -1),           (0, 1),
+		(1, -1),  (1, 0),  (1, 1)
+	]
+	board_size = len(board)
+
+	sos_lines = []
+	current_letter = board[row][col]
+
+	if current_letter == 'S':
+		for dr, dc in directions:
+			if (0 <= row + 2*dr < board_size and 
+				0 <= col + 2*dc < board_size):
+				if (board[row + dr][col + dc] == 'O' and 
+					board[row + 2*dr][col + 2*dc] == 'S'):
+					sos_lines.append(((row, col), (row + 2*dr, col + 2*dc)))
+
+	elif current_letter == 'O':
+		for dr, dc in directions:
+			if (0 <= row - dr < board_size and 
+				0 <= row + dr < board_size and
+				0 <= col - dc < board_size and 
+				0 <= col + dc < board_size):
+				if (board[row - dr][col - dc] == 'S' and 
+					board[row + dr][col + dc] == 'S'):
+					sos_lines.append(((row - dr, col - dc), (row + dr, col + dc)))
+
+	return sos_lines
+
+
+def time_position_checks(game, check, repeat=5):
+	"""Best time to run check(row, col) on every cell once"""
+	cells = [(row, col) for row in range(game.board_size) for col in range(game.board_size)]
+
+	def run():
+		for row, col in cells:
+			check(row, col)
+
+	number = max(1, 20000 // len(cells))
+	return min(timeit.repeat(run, number=number, repeat=repeat)) / number
+
+
+def compare_classic_paths():
+	"""The old hardcoded SOS checks against the compiled classic rule"""
+	print("Per-cell SOS checks (hardcoded vs compiled)")
+	for board_size in (3, 8, 10, 50):
+		game = random_game(board_size)
+		hardcoded = time_position_checks(
+			game, lambda row, col: hardcoded_sos_at_position(game.board, row, col))
+		game.check_all_sos_at_position(0, 0)  # Warm the offset tables
+		compiled = time_position_checks(game, game.check_all_sos_at_position)
+		print(f"  {board_size:>3}x{board_size:<3} hardcoded {hardcoded * 1e3:8.3f} ms"
+			  f"  compiled {compiled * 1e3:8.3f} ms  ({hardcoded / compiled:.2f}x)")
+
+
+def time_whole_board_scan(board_size=1000):
+	position = random_game(board_size).board
+	games = []
+
+	def load_fresh():
+		# A new game each time so load_position cannot reuse an earlier scan
+		game = SOSGameLogic(3)
+		game.game_mode = "General"
+		game.load_position(position)
+		games.append(game)
+
+	load = min(timeit.repeat(load_fresh, number=1, repeat=3))
+	game = games[-1]
+	verify = min(timeit.repeat(game.verify_position, number=1, repeat=3))
+	print(f"Whole-board scan {board_size}x{board_size}: {len(game.sos_lines)} SOS, "
+		  f"load {load:.3f} s, verify {verify:.3f} s")
+
+
+if __name__ == "__main__":
+	compare_classic_paths()
+	time_whole_board_scan()
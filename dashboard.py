@@ -0,0 +1,245 @@
+from tkinter import *
+from math import ceil, sqrt
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from main import SOSGameLogic, ComputerPlayer
+from analysis_cache import AnalysisCache
+
+
+class SimulationWorker(threading.Thread):
+	"""
+	Plays computer-vs-computer games round robin in a background thread and
+	queues move events for the GUI. The GUI never touches the games directly.
+	Events: ("move", index, row, col, letter, color, lines, blue, red, over)
+	and ("reset", index), where index is the game's position in self.games.
+	"""
+
+	def __init__(self, game_count, board_size, game_mode="General", rule=None,
+				 restart_delay=1.0, max_queued_events=10000, cache=None):
+		super().__init__(daemon=True)
+		self.games = []
+		for _ in range(game_count):
+			game = SOSGameLogic(board_size, rule)
+			game.game_mode = game_mode
+			game.blue_player = ComputerPlayer("Blue", cache)
+			game.red_player = ComputerPlayer("Red", cache)
+			game.reset_game()
+			self.games.append(game)
+
+		self.cache = cache
+		self.events = queue.Queue(maxsize=max_queued_events)  # Bounded so the GUI sets the pace
+		self.restart_delay = restart_delay
+		self.moves_played = 0
+		self.games_finished = 0
+		self._finished_at = {}
+		self._stop_event = threading.Event()
+
+	def stop(self):
+		self._stop_event.set()
+
+	def run(self):
+		while not self._stop_event.is_set():
+			played = self.moves_played
+			for index, game in enumerate(self.games):
+				if game.game_over:
+					self._restart_if_due(index, game)
+				else:
+					self._play_move(index, game)
+			if self.moves_played == played:
+				self._stop_event.wait(0.01)  # Every game is waiting to restart
+		if self.cache is not None:
+			self.cache.close()  # Write this thread's pending entries
+
+	def _play_move(self, index, game):
+		player = game.current_player
+		move = player.make_move(game)
+		if move is None:
+			return
+		row, col, letter = move
+		success, lines = game.place_letter(row, col, letter)
+		if not success:
+			return
+
+		self.moves_played += 1
+		if game.game_over:
+			self.games_finished += 1
+			self._finished_at[index] = time.monotonic()
+		self._put(("move", index, row, col, letter, player.color, lines,
+				   game.blue_score, game.red_score, game.game_over))
+
+	def _restart_if_due(self, index, game):
+		if time.monotonic() - self._finished_at.get(index, 0) < self.restart_delay:
+			return
+		game.reset_game()
+		self._put(("reset", index))
+
+	def _put(self, event):
+		# Block while the GUI catches up, but keep checking for stop()
+		while not self._stop_event.is_set():
+			try:
+				self.events.put(event, timeout=0.1)
+				return
+			except queue.Full:
+				pass
+
+
+def coalesce_events(events):
+	"""
+	Fold a batch of queued events into one update per game:
+	{index: {"reset": bool, "cells": {(row, col): (letter, color)},
+	        "lines": [(start, end, color)], "score": (blue, red, over)}}
+	Anything queued before a reset is dropped.
+	"""
+	updates = {}
+	for event in events:
+		index = event[1]
+		if event[0] == "reset":
+			updates[index] = {"reset": True, "cells": {}, "lines": [], "score": (0, 0, False)}
+			continue
+
+		_, _, row, col, letter, color, lines, blue, red, over = event
+		update = updates.setdefault(index, {"reset": False, "cells": {}, "lines": [], "score": None})
+		update["cells"][(row, col)] = (letter, color)
+		update["lines"].extend((start, end, color) for start, end in lines)
+		update["score"] = (blue, red, over)
+	return updates
+
+
+class SpectatorDashboard:
+	def __init__(self, master, game_count=64, board_size=6, game_mode="General",
+				 cell_size=12, frame_interval=33, max_events_per_frame=2000, cache=None):
+		self.master = master
+		self.master.title(f"SOS Dashboard - {game_count} games")
+		self.player_colors = {"Blue": "blue", "Red": "red"}
+		self.board_size = board_size
+		self.cell_size = cell_size
+		self.frame_interval = frame_interval  # Milliseconds between redraws
+		self.max_events_per_frame = max_events_per_frame  # The rest wait for the next frame
+
+		self.worker = SimulationWorker(game_count, board_size, game_mode, cache=cache)
+		self.create_canvas(game_count)
+		self.create_status_bar()
+
+		self.draw_time = 0.0
+		self.frame_gap = frame_interval / 1000
+		self.last_frame = time.perf_counter()
+		self.last_moves = 0
+		self.master.protocol("WM_DELETE_WINDOW", self.close)
+		self.worker.start()
+		self.master.after(self.frame_interval, self.on_frame)
+
+	def create_canvas(self, game_count):
+		board_pixels = self.board_size * self.cell_size
+		self.tile_width = board_pixels + 10
+		self.tile_height = board_pixels + 24
+		self.columns = ceil(sqrt(game_count))
+		rows = ceil(game_count / self.columns)
+
+		self.canvas = Canvas(self.master, width=self.columns * self.tile_width,
+							 height=rows * self.tile_height, bg='white')
+		self.canvas.grid(row=0, column=0, padx=10, pady=10)
+
+		self.cells = []
+		self.score_ids = []
+		for index in range(game_count):
+			x0, y0 = self.tile_origin(index)
+			self.canvas.create_rectangle(x0, y0, x0 + board_pixels, y0 + board_pixels)
+			for i in range(1, self.board_size):
+				self.canvas.create_line(x0 + i * self.cell_size, y0,
+										x0 + i * self.cell_size, y0 + board_pixels, fill='#ccc')
+				self.canvas.create_line(x0, y0 + i * self.cell_size,
+										x0 + board_pixels, y0 + i * self.cell_size, fill='#ccc')
+
+			cells = {}
+			for row in range(self.board_size):
+				for col in range(self.board_size):
+					cells[(row, col)] = self.canvas.create_text(
+						x0 + (col + 0.5) * self.cell_size, y0 + (row + 0.5) * self.cell_size,
+						text='', font=('Helvetica', max(6, self.cell_size // 2)))
+			self.cells.append(cells)
+			self.score_ids.append(self.canvas.create_text(
+				x0, y0 + board_pixels + 8, anchor=W, text="0 : 0", font=('Helvetica', 8)))
+
+	def create_status_bar(self):
+		self.status_label = Label(self.master, text="", font=("Helvetica", 11), anchor=W)
+		self.status_label.grid(row=1, column=0, sticky=EW, padx=10, pady=(0, 10))
+
+	def tile_origin(self, index):
+		row, col = divmod(index, self.columns)
+		return col * self.tile_width + 5, row * self.tile_height + 5
+
+	def on_frame(self):
+		"""Apply a capped batch of queued events in a single redraw, then report timings"""
+		start = time.perf_counter()
+		events = []
+		get_event = self.worker.events.get_nowait
+		try:
+			for _ in range(self.max_events_per_frame):
+				events.append(get_event())
+		except queue.Empty:
+			pass
+
+		for index, update in coalesce_events(events).items():
+			self.apply_update(index, update)
+		self.canvas.update_idletasks()  # Repaint now so it counts towards the draw time
+
+		# Smoothed draw time and frame-to-frame interval, which includes Tk's other work
+		now = time.perf_counter()
+		interval = now - self.last_frame
+		self.draw_time = 0.9 * self.draw_time + 0.1 * (now - start)
+		self.frame_gap = 0.9 * self.frame_gap + 0.1 * interval
+		moves = self.worker.moves_played
+		self.status_label['text'] = (f"Draw {self.draw_time * 1000:.1f} ms | "
+									 f"Frame {self.frame_gap * 1000:.1f} ms ({1 / self.frame_gap:.0f} fps) | "
+									 f"{(moves - self.last_moves) / interval:.0f} moves/s | "
+									 f"{len(events)} events, {self.worker.events.qsize()} queued | "
+									 f"{self.worker.games_finished} games finished")
+		self.last_frame, self.last_moves = now, moves
+		self.master.after(self.frame_interval, self.on_frame)
+
+	def apply_update(self, index, update):
+		tag = f"lines{index}"
+		cells = self.cells[index]
+		if update["reset"]:
+			self.canvas.delete(tag)
+			for text_id in cells.values():
+				self.canvas.itemconfig(text_id, text='')
+
+		for (row, col), (letter, color) in update["cells"].items():
+			self.canvas.itemconfig(cells[(row, col)], text=letter, fill=self.player_colors[color])
+
+		x0, y0 = self.tile_origin(index)
+		for start, end, color in update["lines"]:
+			self.canvas.create_line(x0 + (start[1] + 0.5) * self.cell_size,
+									y0 + (start[0] + 0.5) * self.cell_size,
+									x0 + (end[1] + 0.5) * self.cell_size,
+									y0 + (end[0] + 0.5) * self.cell_size,
+									fill=self.player_colors[color], width=1, tags=tag)
+
+		blue, red, over = update["score"]
+		self.canvas.itemconfig(self.score_ids[index],
+							   text=f"{blue} : {red}" + (" (done)" if over else ""))
+
+	def close(self):
+		self.worker.stop()
+		self.worker.join(timeout=1)
+		self.master.destroy()
+
+
+if __name__ == "__main__":
+	# Usage: python dashboard.py [games] [board_size] [--no-cache]
+	args = [arg for arg in sys.argv[1:] if arg != "--no-cache"]
+	game_count = int(args[0]) if len(args) > 0 else 64
+	board_size = int(args[1]) if len(args) > 1 else 6
+	cache = None
+	if "--no-cache" not in sys.argv:
+		try:
+			cache = AnalysisCache()  # Warm-start from earlier sessions
+		except sqlite3.Error:
+			pass
+	root = Tk()
+	dashboard = SpectatorDashboard(root, game_count, board_size, cache=cache)
+	root.mainloop()
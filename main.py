@@ -2,7 +2,11 @@ from tkinter import *
 from tkinter import simpledialog
 from math import atan2, degrees
 import random
+import sqlite3
 from abc import ABC, abstractmethod
+from operator import itemgetter
+from rules import CLASSIC_SOS
+from analysis_cache import AnalysisCache
 
 class Player(ABC):
 	def __init__(self, color):
@@ -35,44 +39,102 @@ class HumanPlayer(Player):
 		return None
 
 class ComputerPlayer(Player):
-	def __init__(self, color):
+	def __init__(self, color, cache=None):
 		super().__init__(color)
+		self.cache = cache  # Optional AnalysisCache shared across games and sessions
 
 	def make_move(self, game_logic):
+		"""
+		With a cache, the deterministic part of choose_move (the first scoring
+		move in canonical cell order, or that no move scores) is looked up, or
+		evaluated and stored, for every position. Only the random fallback runs
+		after a hit. Without a cache this is just choose_move.
+		"""
+		if self.cache is None:
+			return self.choose_move(game_logic)
+
+		position = self.cache.position_key(game_logic)
+		evaluation = self.cache.lookup(game_logic, position)
+		if evaluation is None or (evaluation[0] is not None and
+								  not self.is_legal(game_logic, evaluation[0])):
+			board_size = game_logic.board_size
+			cells = [divmod(index, board_size) for index in position[1]]
+			best = self.first_scoring_move(game_logic, cells)
+			evaluation = (best[:3], best[3]) if best is not None else (None, 0)
+			self.cache.store(game_logic, evaluation[0], evaluation[1], position)
+
+		move = evaluation[0]
+		return move if move is not None else self.fallback_move(game_logic)
+
+	@staticmethod
+	def is_legal(game_logic, move):
+		row, col, letter = move[:3]
+		return (0 <= row < game_logic.board_size and 0 <= col < game_logic.board_size and
+				game_logic.board[row][col] == '' and letter in game_logic.letters)
+
+	def first_scoring_move(self, game_logic, cells):
+		"""
+		Deterministic evaluation: the first empty cell in cells and letter that
+		completes an SOS, as (row, col, letter, score), or None if no move scores
+		"""
+		board = game_logic.board
+		for row, col in cells:
+			if board[row][col] != '':
+				continue
+			for letter in game_logic.letters:
+				score = self.evaluate_move(game_logic, (row, col, letter))
+				if score > 0:
+					return row, col, letter, score
+		return None
+
+	def evaluate_move(self, game_logic, move):
+		"""Score a move by the number of SOS it completes"""
+		row, col, letter = move
+		original = game_logic.board[row][col]
+		game_logic.board[row][col] = letter
+		score = len(game_logic.check_all_sos_at_position(row, col))
+		game_logic.board[row][col] = original
+		return score
+
+	def choose_move(self, game_logic):
 		"""Implement computer player strategy"""
 		valid_moves = game_logic.get_valid_moves()
+
+		# Strategy 1: Complete an SOS if possible
+		best = self.first_scoring_move(game_logic, valid_moves)
+		if best is not None:
+			return best[:3]
+		return self.fallback_move(game_logic, valid_moves)
+
+	def fallback_move(self, game_logic, valid_moves=None):
+		"""The random part of the strategy, for positions where no move scores"""
+		if valid_moves is None:
+			valid_moves = game_logic.get_valid_moves()
 		if not valid_moves:
 			return None
 
-		# Strategy 1: Complete an SOS if possible
-		for row, col in valid_moves:
-			for letter in ['S', 'O']:
-				if game_logic.check_potential_sos(row, col, letter):
-					return row, col, letter
-
-		# Strategy 2: Block opponent's potential SOS
-		for row, col in valid_moves:
-			for letter in ['S', 'O']:
-				if game_logic.check_potential_sos(row, col, letter):
-					return row, col, letter
-
-		# Strategy 3: Try to set up future SOS opportunities
+		letters = game_logic.letters
+
+		# Strategy 2: Try to set up future SOS opportunities
 		corner_moves = [(r, c) for r, c in valid_moves 
 					   if r in [0, game_logic.board_size-1] and 
 					   c in [0, game_logic.board_size-1]]
 		if corner_moves:
 			move = random.choice(corner_moves)
-			return move[0], move[1], 'S'  # Prefer 'S' in corners
+			return move[0], move[1], letters[0]  # Prefer 'S' in corners
 
-		# Strategy 4: Random move with weighted letter choice
+		# Strategy 3: Random move with weighted letter choice
 		move = random.choice(valid_moves)
-		letter = random.choice(['S', 'S', 'O'])  # Prefer 'S' slightly
+		letter = random.choice([letters[0]] + list(letters))  # Prefer 'S' slightly
 		return move[0], move[1], letter
 
 class SOSGameLogic:
-	def __init__(self, board_size):
+	def __init__(self, board_size, rule=None):
 		self.board_size = board_size
+		self.rule = rule if rule is not None else CLASSIC_SOS  # A rules.PatternRule
+		self.rule.check_board_size(board_size)
 		self.sos_lines = []
+		self._last_scan = None  # (rule, row strings, lines) from the latest whole-board scan
 		self.blue_player = HumanPlayer("Blue")  # Default to human players
 		self.red_player = HumanPlayer("Red")
 		self.reset_game()
@@ -117,34 +179,16 @@ class SOSGameLogic:
 
 		return True, new_sos_lines
 
-	def check_all_sos_at_position(self, row, col):
-		directions = [
-			(-1, -1), (-1, 0), (-1, 1),
-			(0, -1),           (0, 1),
-			(1, -1),  (1, 0),  (1, 1)
-		]
-
-		sos_lines = []
-		current_letter = self.board[row][col]
-
-		if current_letter == 'S':
-			for dr, dc in directions:
-				if (0 <= row + 2*dr < self.board_size and 
-					0 <= col + 2*dc < self.board_size):
-					if (self.board[row + dr][col + dc] == 'O' and 
-						self.board[row + 2*dr][col + 2*dc] == 'S'):
-						sos_lines.append(((row, col), (row + 2*dr, col + 2*dc)))
-
-		elif current_letter == 'O':
-			for dr, dc in directions:
-				if (0 <= row - dr < self.board_size and 
-					0 <= row + dr < self.board_size and
-					0 <= col - dc < self.board_size and 
-					0 <= col + dc < self.board_size):
-					if (self.board[row - dr][col - dc] == 'S' and 
-						self.board[row + dr][col + dc] == 'S'):
-						sos_lines.append(((row - dr, col - dc), (row + dr, col + dc)))
+	@property
+	def letters(self):
+		"""Letters a player can place, pattern end letter first"""
+		return self.rule.letters
 
+	def check_all_sos_at_position(self, row, col):
+		sos_lines = self.rule.lines_at(self.board, row, col)
+		if sos_lines and self.rule is CLASSIC_SOS and self.board[row][col] == 'O':
+			# Classic scoring counts an SOS completed by its O once from each side
+			sos_lines += [(end, start) for start, end in sos_lines]
 		return sos_lines
 
 	def is_board_full(self):
@@ -172,6 +216,101 @@ class SOSGameLogic:
 		self.board[row][col] = original
 		return len(sos_lines) > 0
 
+	def load_position(self, position, blue_score=None, red_score=None, current_color="Blue"):
+		"""
+		Load an arbitrary position and find every SOS on it in one pass.
+		position: multi-line string ('.' or '-' for empty), list of rows or 2D array
+		Imported SOS lines are unattributed (color None); scores left out are
+		inferred so that blue_score + red_score equals the number of SOS found.
+		"""
+		if current_color not in ("Blue", "Red"):
+			raise ValueError(f"current_color must be 'Blue' or 'Red', not {current_color!r}")
+
+		# Validate everything before touching the game so a bad position leaves it intact
+		board = parse_position(position, self.letters)
+		lines = self._scan(board)
+		if blue_score is None:
+			blue_score = len(lines) - (red_score or 0)
+		if red_score is None:
+			red_score = len(lines) - blue_score
+		if blue_score < 0 or red_score < 0 or blue_score + red_score != len(lines):
+			raise ValueError(f"Scores {blue_score}/{red_score} do not match "
+							 f"{len(lines)} SOS on the board")
+
+		self.board_size = len(board)
+		self.board = board
+		self.current_player = self.blue_player if current_color == "Blue" else self.red_player
+		self.last_sos_count = 0
+		self.sos_lines.clear()
+		self.sos_lines.extend([(start, end, None) for start, end in lines])
+		self.blue_score = blue_score
+		self.red_score = red_score
+		self.game_over = self.is_board_full() or (self.game_mode == "Simple" and len(lines) > 0)
+
+	def scan_all_sos(self):
+		"""
+		Returns every SOS on the board as (start, end) tuples, each line once.
+		Rows, columns and diagonals are scanned as strings by the rule.
+		"""
+		return list(self._scan(self.board))
+
+	def _scan(self, board):
+		"""Scan board, reusing the previous result if its contents are unchanged"""
+		rule = self.rule
+		rows = rule.board_rows(board)
+		if self._last_scan is not None and self._last_scan[:2] == (rule, rows):
+			return self._last_scan[2]
+		lines = rule.scan_rows(rows)
+		self._last_scan = (rule, rows, lines)
+		return lines
+
+	def verify_position(self):
+		"""
+		Check that sos_lines and the scores are consistent with the board.
+		Note an SOS completed by placing its O is recorded twice by place_letter,
+		so lines are compared as sets and scores against len(sos_lines).
+		"""
+		# Fast path: a freshly loaded position records lines in scan order
+		on_board = self._scan(self.board)
+		if list(map(itemgetter(0, 1), self.sos_lines)) != on_board:
+			# Scanned lines already have start <= end; recorded ones may not
+			recorded = {(start, end) if start <= end else (end, start)
+						for start, end, _ in self.sos_lines}
+			if set(on_board) != recorded:
+				return False
+
+		if self.blue_score + self.red_score != len(self.sos_lines):
+			return False
+		colors = [color for _, _, color in self.sos_lines]
+		return colors.count("Blue") <= self.blue_score and colors.count("Red") <= self.red_score
+
+
+def parse_position(position, letters=('S', 'O')):
+	"""
+	Convert a string, list of rows or 2D array into a square board of
+	'' and letter cells. Raises ValueError on anything else.
+	"""
+	cell_values = dict(_EMPTY_CELLS)
+	for letter in letters:
+		cell_values[letter] = cell_values[letter.lower()] = letter
+
+	if isinstance(position, str):
+		position = [line.strip() for line in position.splitlines() if line.strip()]
+
+	board = []
+	for row in position:
+		try:
+			board.append([cell_values[cell] for cell in row])
+		except (KeyError, TypeError):
+			raise ValueError(f"Invalid cell in position row {row!r}") from None
+
+	if not board or any(len(row) != len(board) for row in board):
+		raise ValueError("Position must be a non-empty square board")
+	return board
+
+
+_EMPTY_CELLS = {None: '', '': '', '.': '', '-': '', ' ': ''}
+
 
 
 class SOSGUI:
@@ -181,6 +320,10 @@ class SOSGUI:
 		self.game_mode = StringVar(value="Simple")
 		self.player_colors = {"Blue": "blue", "Red": "red"}
 		self.cell_size = 50
+		try:
+			self.analysis_cache = AnalysisCache()
+		except sqlite3.Error:
+			self.analysis_cache = None  # Computer players just won't warm-start
 		self.show_setup_dialog()
 		self.master.minsize(600, 800)
 
@@ -279,9 +422,9 @@ class SOSGUI:
 
 		# Initialize players based on selection
 		self.game_logic.blue_player = (HumanPlayer("Blue") if self.blue_player_type == "Human" 
-									 else ComputerPlayer("Blue"))
+									 else ComputerPlayer("Blue", self.analysis_cache))
 		self.game_logic.red_player = (HumanPlayer("Red") if self.red_player_type == "Human" 
-									else ComputerPlayer("Red"))
+									else ComputerPlayer("Red", self.analysis_cache))
 
 		# Reset game to ensure proper initialization
 		self.game_logic.reset_game()
@@ -546,8 +689,8 @@ class SOSGUI:
 				self.master.after_cancel(int(after_id))
 
 			# Create new players before updating game logic
-			new_blue_player = HumanPlayer("Blue") if blue_player.get() == "Human" else ComputerPlayer("Blue")
-			new_red_player = HumanPlayer("Red") if red_player.get() == "Human" else ComputerPlayer("Red")
+			new_blue_player = HumanPlayer("Blue") if blue_player.get() == "Human" else ComputerPlayer("Blue", self.analysis_cache)
+			new_red_player = HumanPlayer("Red") if red_player.get() == "Human" else ComputerPlayer("Red", self.analysis_cache)
 
 			# Update game mode and players
 			self.game_mode.set(new_mode.get())
@@ -608,3 +751,5 @@ if __name__ == "__main__":
 	root = Tk()
 	gui = SOSGUI(root)
 	root.mainloop()
+	if gui.analysis_cache is not None:
+		gui.analysis_cache.close()  # Write entries still pending
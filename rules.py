@@ -0,0 +1,206 @@
+from itertools import repeat
+from operator import add, sub
+
+ALL_LINES = ((0, 1), (1, 0), (1, 1), (1, -1))  # Row, column, diagonal, anti-diagonal
+ORTHOGONAL_LINES = ((0, 1), (1, 0))
+
+
+class PatternRule:
+	"""
+	A line pattern (e.g. "SOS" or "SOOS") compiled once per board size into
+	per-cell offset tables. Each pattern on the board is reported once per
+	placement; non-palindromic patterns match in both reading directions.
+	wrap=True treats the board as a torus, which must then be larger than the
+	pattern so a line cannot wrap onto itself; smaller boards raise ValueError.
+
+	A line is (start, end) with end = start + (len(pattern) - 1) * direction for
+	one of ALL_LINES, so start <= end. On a wrapped board end may lie past the
+	edge (take it modulo the board size); this keeps lines that share their end
+	cells, e.g. both SOS in row OSOS of a 4x4 torus, distinct.
+	"""
+
+	def __init__(self, pattern="SOS", directions=ALL_LINES, wrap=False):
+		self.pattern = pattern.upper()
+		if len(self.pattern) < 2:
+			raise ValueError("Pattern must be at least two letters long")
+		self.directions = tuple(self._canonical_direction(d) for d in directions)
+		self.wrap = wrap
+		self.letters = tuple(dict.fromkeys(self.pattern))  # In order of first use
+		self.palindrome = self.pattern == self.pattern[::-1]
+
+		# Smallest shift at which the pattern can overlap itself
+		length = len(self.pattern)
+		self._shift = next(p for p in range(1, length + 1)
+						   if self.pattern[p:] == self.pattern[:length - p])
+		self._tables = {}
+
+	@staticmethod
+	def _canonical_direction(direction):
+		dr, dc = direction
+		if (dr, dc) in ALL_LINES:
+			return dr, dc
+		if (-dr, -dc) in ALL_LINES:
+			return -dr, -dc
+		raise ValueError(f"Unsupported line direction {direction!r}")
+
+	@property
+	def key(self):
+		"""Stable text identifying the rule, e.g. 'SOS/flat/0,1;1,0'"""
+		directions = ';'.join(f"{dr},{dc}" for dr, dc in self.directions)
+		return f"{self.pattern}/{'wrap' if self.wrap else 'flat'}/{directions}"
+
+	def check_board_size(self, board_size):
+		"""Raise ValueError if the rule cannot score a board of this size"""
+		if self.wrap and board_size <= len(self.pattern):
+			raise ValueError(f"A wrapped {self.pattern} rule needs a board larger than "
+							 f"{len(self.pattern)}x{len(self.pattern)}, not {board_size}x{board_size}")
+
+	def _line_cells(self, board_size, row, col, index, dr, dc):
+		"""Cells of the line through (row, col) at pattern index, or None if off board"""
+		cells = []
+		for j in range(len(self.pattern)):
+			r, c = row + (j - index)*dr, col + (j - index)*dc
+			if self.wrap:
+				r, c = r % board_size, c % board_size
+			elif not (0 <= r < board_size and 0 <= c < board_size):
+				return None
+			cells.append((r, c))
+		return cells
+
+	def _compile_cell(self, board_size, row, col):
+		"""Returns {letter: [(checks, (start, end)), ...]} for one cell"""
+		# A palindrome read backwards is the same line, so one orientation suffices
+		oriented = list(self.directions)
+		if not self.palindrome:
+			oriented += [(-dr, -dc) for dr, dc in self.directions]
+
+		span = len(self.pattern) - 1
+		table = {}
+		for index, letter in enumerate(self.pattern):
+			for dr, dc in oriented:
+				cells = self._line_cells(board_size, row, col, index, dr, dc)
+				if cells is None:
+					continue
+				checks = tuple((r, c, self.pattern[j])
+							   for j, (r, c) in enumerate(cells) if j != index)
+				# Report the line from the end its canonical direction starts at
+				if (dr, dc) in self.directions:
+					start = cells[0]
+				else:
+					start, dr, dc = cells[-1], -dr, -dc
+				line = (start, (start[0] + span*dr, start[1] + span*dc))
+				table.setdefault(letter, []).append((checks, line))
+		return table
+
+	def lines_at(self, board, row, col):
+		"""Returns the (start, end) lines completed by the letter at (row, col)"""
+		table = self._tables.get(len(board))
+		if table is None:
+			self.check_board_size(len(board))
+			table = self._tables[len(board)] = [[None] * len(board) for _ in board]
+		entries = table[row][col]
+		if entries is None:
+			entries = table[row][col] = self._compile_cell(len(board), row, col)
+
+		lines = []
+		for checks, line in entries.get(board[row][col], ()):
+			for r, c, letter in checks:
+				if board[r][c] != letter:
+					break
+			else:
+				lines.append(line)
+		return lines
+
+	def scan_board(self, board):
+		"""
+		Returns every pattern on the board as (start, end) tuples, each line once.
+		Every line family is scanned as strings instead of checking each cell.
+		"""
+		return self.scan_rows(self.board_rows(board))
+
+	@staticmethod
+	def board_rows(board):
+		"""The board as one string per row, '.' marking empty cells"""
+		return [''.join([cell or '.' for cell in row]) for row in board]
+
+	def scan_rows(self, rows):
+		"""scan_board for a board already converted by board_rows"""
+		n = len(rows)
+		length = len(self.pattern)
+		self.check_board_size(n)
+		if n < length:
+			return []
+
+		lines = []
+		span = length - 1
+		for dr, dc in self.directions:
+			sequences, origin = self._sequences(rows, dr, dc)
+			for k, seq in enumerate(sequences):
+				starts = self._find_all(seq, self.pattern)
+				if not self.palindrome:
+					starts += self._find_all(seq, self.pattern[::-1])
+				if not starts:
+					continue
+				r0, c0 = origin(k)
+				if self.wrap:
+					# Only the column of a wrapped diagonal can leave the board
+					lines.extend([((r0 + i*dr, c), (r0 + (i + span)*dr, c + span*dc))
+								  for i, c in zip(starts, [(c0 + i*dc) % n for i in starts])])
+					continue
+				# Build the coordinate tuples with map/zip so the per-line work stays in C
+				lines.extend(zip(zip(_along(r0, dr, starts), _along(c0, dc, starts)),
+								 zip(_along(r0 + span*dr, dr, starts), _along(c0 + span*dc, dc, starts))))
+		return lines
+
+	def _sequences(self, rows, dr, dc):
+		"""Returns (strings, origin of string k) covering every line in direction (dr, dc)"""
+		n = len(rows)
+		tail = len(self.pattern) - 1
+
+		if self.wrap:
+			# Rotating row r by r turns wrapped diagonals into columns
+			if (dr, dc) == (0, 1):
+				grid = rows
+			elif (dr, dc) == (1, 0):
+				grid = list(map(''.join, zip(*rows)))
+			elif (dr, dc) == (1, 1):
+				grid = list(map(''.join, zip(*[rows[r][r:] + rows[r][:r] for r in range(n)])))
+			else:
+				grid = list(map(''.join, zip(*[rows[r][n - r:] + rows[r][:n - r] for r in range(n)])))
+			origin = (lambda k: (k, 0)) if (dr, dc) == (0, 1) else (lambda k: (0, k))
+			return [seq + seq[:tail] for seq in grid], origin
+
+		pad = '.' * (n - 1)
+		if (dr, dc) == (0, 1):
+			return rows, lambda k: (k, 0)
+		if (dr, dc) == (1, 0):
+			return map(''.join, zip(*rows)), lambda k: (0, k)
+		if (dr, dc) == (1, 1):
+			# Shifting row r right by (n-1-r) turns diagonals into columns
+			return (map(''.join, zip(*[pad[r:] + rows[r] + pad[:r] for r in range(n)])),
+					lambda k: (0, k - n + 1))
+		return (map(''.join, zip(*[pad[:r] + rows[r] + pad[r:] for r in range(n)])),
+				lambda k: (0, k))
+
+	def _find_all(self, seq, pattern):
+		i = seq.find(pattern)
+		if i < 0:
+			return []
+		starts = []
+		find, shift = seq.find, self._shift
+		while i >= 0:
+			starts.append(i)
+			i = find(pattern, i + shift)
+		return starts
+
+
+def _along(origin, step, indexes):
+	"""origin + i*step for each i in indexes, computed lazily"""
+	if step == 0:
+		return repeat(origin, len(indexes))
+	if step == 1:
+		return map(add, repeat(origin), indexes)
+	return map(sub, repeat(origin), indexes)  # step == -1
+
+
+CLASSIC_SOS = PatternRule("SOS")
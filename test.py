@@ -1,6 +1,12 @@
+import os
+import tempfile
+import time
 import unittest
 from tkinter import *
-from main import SOSGameLogic
+from main import SOSGameLogic, ComputerPlayer
+from rules import PatternRule, ORTHOGONAL_LINES
+from dashboard import SimulationWorker, coalesce_events
+from analysis_cache import AnalysisCache
 
 
 class TestSOSGameSimpleMode(unittest.TestCase):
@@ -127,5 +133,334 @@ class TestSOSGameGeneralMode(unittest.TestCase):
 		                 4)  # Blue should get points for all SOS patterns
 
 
+class TestSOSPositionLoading(unittest.TestCase):
+
+	def setUp(self):
+		self.game = SOSGameLogic(3)
+		self.game.game_mode = "General"
+
+	def test_load_position_from_string(self):
+		"""Test loading a position string finds every SOS once"""
+		self.game.load_position("""
+			SOS.
+			.O..
+			S.S.
+			....
+		""")
+
+		self.assertEqual(self.game.board_size, 4)
+		self.assertEqual(self.game.board[1][1], 'O')
+		self.assertEqual(self.game.board[3][3], '')
+		self.assertEqual(len(self.game.sos_lines), 3)  # Row and both diagonals
+		self.assertEqual(self.game.blue_score + self.game.red_score, 3)
+		self.assertTrue(self.game.verify_position())
+
+	def test_load_position_from_list(self):
+		"""Test loading a list of rows with mixed empty markers"""
+		self.game.load_position([['S', None, ''], ['O', '.', 'o'], ['S', '-', 's']],
+		                        blue_score=0, red_score=1)
+
+		self.assertEqual(self.game.red_score, 1)
+		self.assertEqual(self.game.sos_lines, [((0, 0), (2, 0), None)])
+		self.assertFalse(self.game.game_over)
+
+	def test_load_position_rejects_bad_input(self):
+		"""Test invalid cells, non-square boards and wrong scores are rejected"""
+		with self.assertRaises(ValueError):
+			self.game.load_position("SOX\n...\n...")
+		with self.assertRaises(ValueError):
+			self.game.load_position("SOS\n...")
+		with self.assertRaises(ValueError):
+			self.game.load_position("SOS\n...\n...", blue_score=2, red_score=0)
+
+	def test_failed_load_leaves_game_intact(self):
+		"""Test a rejected position does not replace the current game"""
+		self.game.place_letter(0, 0, 'S')
+		self.game.place_letter(0, 1, 'O')
+		self.game.place_letter(0, 2, 'S')
+
+		with self.assertRaises(ValueError):
+			self.game.load_position("SOS.\n....\n....\n....", blue_score=5)
+		with self.assertRaises(ValueError):
+			self.game.load_position("....\n....\n....\n....", current_color="Green")
+
+		self.assertEqual(self.game.board_size, 3)
+		self.assertEqual(self.game.board[0], ['S', 'O', 'S'])
+		self.assertEqual(self.game.blue_score, 1)
+		self.assertTrue(self.game.verify_position())
+
+	def test_scan_matches_replayed_game(self):
+		"""Test the whole-board scan agrees with a game played move by move"""
+		moves = [(0, 0, 'S'), (0, 1, 'O'), (0, 2, 'S'), (1, 1, 'O'),
+		         (2, 2, 'S'), (2, 0, 'S'), (1, 0, 'O'), (2, 1, 'O')]
+		for row, col, letter in moves:
+			self.game.place_letter(row, col, letter)
+
+		self.assertTrue(self.game.verify_position())
+		self.game.blue_score += 1
+		self.assertFalse(self.game.verify_position())
+
+	def test_verify_detects_missing_line(self):
+		"""Test verification fails when the board has an unrecorded SOS"""
+		self.game.board[0] = ['S', 'O', 'S']
+		self.assertFalse(self.game.verify_position())
+
+
+class TestPatternRules(unittest.TestCase):
+
+	def test_classic_rule_counts_o_completed_sos_twice(self):
+		"""Test the classic rule keeps its double count for an SOS completed by the O"""
+		classic = SOSGameLogic(5)
+		plain = SOSGameLogic(5, PatternRule("SOS"))
+		rows = ["SOSOS", "OSOSO", "SOSOS", "OOSSO", "SSOOS"]
+		classic.board = [list(row) for row in rows]
+		plain.board = [list(row) for row in rows]
+
+		for row in range(5):
+			for col in range(5):
+				found = plain.check_all_sos_at_position(row, col)
+				classic_lines = classic.check_all_sos_at_position(row, col)
+				self.assertEqual(len(found), len(set(found)))  # Each line once
+				self.assertEqual({tuple(sorted(line)) for line in classic_lines},
+				                 {tuple(sorted(line)) for line in found})
+				copies = 2 if rows[row][col] == 'O' else 1
+				self.assertEqual(len(classic_lines), copies * len(found))
+
+	def test_longer_pattern(self):
+		"""Test a four letter pattern completed in the middle"""
+		game = SOSGameLogic(4, PatternRule("SOOS"))
+		game.game_mode = "General"
+		for row, col, letter in [(0, 0, 'S'), (0, 1, 'O'), (0, 3, 'S')]:
+			game.place_letter(row, col, letter)
+		success, lines = game.place_letter(0, 2, 'O')
+
+		self.assertTrue(success)
+		self.assertEqual(lines, [((0, 0), (0, 3))])
+		self.assertEqual(game.letters, ('S', 'O'))
+		self.assertTrue(game.verify_position())
+
+	def test_orthogonal_only(self):
+		"""Test diagonal lines are ignored by an orthogonal rule"""
+		game = SOSGameLogic(3, PatternRule("SOS", ORTHOGONAL_LINES))
+		game.game_mode = "General"
+		game.place_letter(0, 0, 'S')
+		game.place_letter(1, 1, 'O')
+		_, lines = game.place_letter(2, 2, 'S')
+
+		self.assertEqual(lines, [])
+		self.assertEqual(game.scan_all_sos(), [])
+
+	def test_wrap_around(self):
+		"""Test lines continue across the edges of a toroidal board"""
+		game = SOSGameLogic(4, PatternRule("SOS", wrap=True))
+		game.game_mode = "General"
+		game.place_letter(0, 3, 'S')
+		game.place_letter(0, 0, 'O')
+		_, lines = game.place_letter(0, 1, 'S')
+
+		self.assertEqual(lines, [((0, 3), (0, 5))])  # End lies past the edge
+		self.assertEqual(game.scan_all_sos(), [((0, 3), (0, 5))])
+		self.assertTrue(game.verify_position())
+
+	def test_wrapped_lines_sharing_end_cells(self):
+		"""Test two wrapped lines between the same cells stay distinct"""
+		game = SOSGameLogic(4, PatternRule("SOS", ORTHOGONAL_LINES, wrap=True))
+		game.game_mode = "General"
+		game.load_position("OSOS\n....\n....\n....")
+
+		self.assertEqual(sorted(game.scan_all_sos()), [((0, 1), (0, 3)), ((0, 3), (0, 5))])
+		self.assertTrue(game.verify_position())
+
+		game.sos_lines.pop()
+		game.blue_score -= 1
+		self.assertFalse(game.verify_position())
+
+	def test_wrap_needs_board_larger_than_pattern(self):
+		"""Test a wrapped rule refuses boards it would silently fail to score"""
+		rule = PatternRule("SOS", wrap=True)
+		with self.assertRaises(ValueError):
+			SOSGameLogic(3, rule)
+		with self.assertRaises(ValueError):
+			rule.lines_at([['S', 'O', 'S'], ['', '', ''], ['', '', '']], 0, 2)
+		with self.assertRaises(ValueError):
+			rule.scan_board([['S', 'O', 'S'], ['', '', ''], ['', '', '']])
+
+		game = SOSGameLogic(4, rule)
+		with self.assertRaises(ValueError):
+			game.load_position("SOS\n...\n...")
+		self.assertEqual(game.board_size, 4)
+
+	def test_computer_player_plays_first_scoring_move(self):
+		"""Test an uncached computer player takes the first scoring move, not the best"""
+		game = SOSGameLogic(3)
+		game.blue_player = ComputerPlayer("Blue")
+		game.load_position("S.S\n...\nS.S")
+
+		self.assertEqual(game.current_player.make_move(game), (0, 1, 'O'))
+
+	def test_computer_player_uses_rule_letters(self):
+		"""Test the computer player completes a pattern of other letters"""
+		game = SOSGameLogic(3, PatternRule("XYX"))
+		game.red_player = ComputerPlayer("Red")
+		game.load_position("X..\n...\n..X", current_color="Red")
+
+		self.assertEqual(game.current_player.make_move(game), (1, 1, 'Y'))
+
+	def test_unsupported_direction(self):
+		"""Test directions other than rows, columns and diagonals are rejected"""
+		with self.assertRaises(ValueError):
+			PatternRule("SOS", [(1, 2)])
+
+
+class TestDashboardEvents(unittest.TestCase):
+
+	def test_coalesce_groups_moves_per_game(self):
+		"""Test queued moves fold into one update per game"""
+		events = [("move", 0, 0, 0, 'S', "Blue", [], 0, 0, False),
+		          ("move", 1, 1, 1, 'O', "Blue", [], 0, 0, False),
+		          ("move", 0, 0, 1, 'O', "Red", [], 0, 0, False),
+		          ("move", 0, 0, 2, 'S', "Blue", [((0, 0), (0, 2))], 1, 0, False)]
+		updates = coalesce_events(events)
+
+		self.assertEqual(set(updates), {0, 1})
+		self.assertEqual(len(updates[0]["cells"]), 3)
+		self.assertEqual(updates[0]["lines"], [((0, 0), (0, 2), "Blue")])
+		self.assertEqual(updates[0]["score"], (1, 0, False))
+
+	def test_coalesce_drops_events_before_reset(self):
+		"""Test a reset discards moves queued before it"""
+		events = [("move", 0, 0, 0, 'S', "Blue", [], 0, 0, True),
+		          ("reset", 0),
+		          ("move", 0, 2, 2, 'O', "Blue", [], 0, 0, False)]
+		update = coalesce_events(events)[0]
+
+		self.assertTrue(update["reset"])
+		self.assertEqual(update["cells"], {(2, 2): ('O', "Blue")})
+
+	def test_worker_plays_games_in_background(self):
+		"""Test the simulation worker plays legal games and queues their moves"""
+		worker = SimulationWorker(4, 3, restart_delay=0)
+		worker.start()
+		deadline = time.monotonic() + 5
+		while worker.games_finished < 4 and time.monotonic() < deadline:
+			time.sleep(0.01)
+		worker.stop()
+		worker.join()
+
+		self.assertGreaterEqual(worker.games_finished, 4)
+		self.assertFalse(worker.events.empty())
+		self.assertTrue(all(game.verify_position() for game in worker.games))
+
+
+class TestAnalysisCache(unittest.TestCase):
+
+	def setUp(self):
+		self.directory = tempfile.TemporaryDirectory()
+		self.path = os.path.join(self.directory.name, "analysis.sqlite3")
+		self.cache = AnalysisCache(self.path)
+		self.game = SOSGameLogic(3)
+
+	def tearDown(self):
+		self.cache.close()
+		self.directory.cleanup()
+
+	def test_store_and_lookup(self):
+		"""Test a stored move is returned for the same position only"""
+		self.game.place_letter(0, 0, 'S')
+		self.assertIsNone(self.cache.lookup(self.game))
+
+		self.cache.store(self.game, (2, 2, 'S'), 1)
+		self.assertEqual(self.cache.lookup(self.game), ((2, 2, 'S'), 1))
+
+		self.game.switch_player()  # Other side to move
+		self.assertIsNone(self.cache.lookup(self.game))
+
+	def test_lookup_under_symmetry(self):
+		"""Test a rotated position finds the rotated move"""
+		self.game.load_position("SO.\n...\n...")
+		self.cache.store(self.game, (2, 0, 'O'), 0)
+
+		self.game.load_position("..S\n..O\n...")  # Rotated 90 degrees clockwise
+		self.assertEqual(self.cache.lookup(self.game), ((0, 0, 'O'), 0))
+
+	def test_least_recently_used_eviction(self):
+		"""Test the cache stays within max_entries, evicting the oldest entry"""
+		cache = AnalysisCache(self.path, max_entries=2, evict_every=1, store_batch=1)
+		positions = ["S..\n...\n...", ".O.\n...\n...", "...\n.S.\n..."]
+
+		self.game.load_position(positions[0])
+		cache.store(self.game, (2, 2, 'S'), 0)
+		self.game.load_position(positions[1])
+		cache.store(self.game, (2, 2, 'S'), 0)
+		self.game.load_position(positions[0])
+		cache.lookup(self.game)  # Now the most recently used
+		self.game.load_position(positions[2])
+		cache.store(self.game, (0, 0, 'S'), 0)
+
+		self.assertEqual(len(cache), 2)
+		self.game.load_position(positions[1])
+		self.assertIsNone(cache.lookup(self.game))
+		self.game.load_position(positions[0])
+		self.assertIsNotNone(cache.lookup(self.game))
+		cache.close()
+
+	def test_computer_player_warm_starts(self):
+		"""Test computer players share scoring moves across caches on one file"""
+		self.game.red_player = ComputerPlayer("Red", self.cache)
+		self.game.load_position("SO.\n...\n...", current_color="Red")
+		self.assertEqual(self.game.current_player.make_move(self.game), (0, 2, 'S'))
+		self.assertEqual(len(self.cache), 1)
+
+		other_cache = AnalysisCache(self.path)
+		self.game.load_position("S..\nO..\n...", current_color="Red")  # Transposed
+		self.assertEqual(other_cache.lookup(self.game), ((2, 0, 'S'), 1))
+		other_cache.close()
+
+	def test_opening_is_served_from_cache(self):
+		"""Test a repeated opening skips the move scan and keeps its random choice"""
+		game = SOSGameLogic(8)
+		game.blue_player = ComputerPlayer("Blue", self.cache)
+		game.reset_game()
+		game.current_player.make_move(game)
+		self.assertEqual(len(self.cache), 1)
+		self.assertEqual(self.cache.lookup(game), (None, 0))  # No move scores
+
+		scanned = []
+		check = game.check_all_sos_at_position
+		game.check_all_sos_at_position = lambda row, col: scanned.append((row, col)) or check(row, col)
+		moves = {game.current_player.make_move(game) for _ in range(50)}
+		self.assertEqual(scanned, [])
+		self.assertGreater(len(moves), 1)  # Corner and letter are still random
+
+	def test_cached_games_still_vary(self):
+		"""Test only the deterministic evaluation is cached so games still vary"""
+		game = SOSGameLogic(4)  # Every 3x3 game ends on the same board
+		game.game_mode = "General"
+		game.blue_player = ComputerPlayer("Blue", self.cache)
+		game.red_player = ComputerPlayer("Red", self.cache)
+
+		final_boards = set()
+		for _ in range(20):
+			game.reset_game()
+			while not game.game_over:
+				row, col, letter = game.current_player.make_move(game)
+				game.place_letter(row, col, letter)
+			final_boards.add(str(game.board))
+		self.assertGreater(len(final_boards), 1)
+
+	def test_database_errors_count_as_misses(self):
+		"""Test a corrupt cache file behaves like an empty cache"""
+		self.game.load_position("SO.\n...\n...")
+		self.cache.store(self.game, (0, 2, 'S'), 1)
+		self.cache.close()
+		with open(self.path, "wb") as cache_file:
+			cache_file.write(b"not a database" * 100)
+
+		self.assertIsNone(self.cache.lookup(self.game))
+		self.cache.store(self.game, (0, 2, 'S'), 1)
+		player = ComputerPlayer("Blue", self.cache)
+		self.assertEqual(player.make_move(self.game), (0, 2, 'S'))
+
+
 if __name__ == '__main__':
 	unittest.main()